@@ -0,0 +1,2 @@
+# Models are defined once in agent.models; import them from here or there, never redefine them
+from .models import TradingSignal, SentimentType, TradeAnalysis, MarketData, MarketSnapshot, SentimentAnalysis
@@ -0,0 +1,60 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Tuple
+
+class AsyncTTLCache:
+    """LRU cache of awaitable results that expire after `ttl` seconds
+
+    Entries hold the shared future, so concurrent callers for the same key wait on one fetch.
+    Failed fetches and `None` results are not kept.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, asyncio.Future]]" = OrderedDict()
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached result for `key`, calling `fetch` on a miss"""
+        now = time.monotonic()
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, fut = entry
+            if expires_at > now:
+                self._data.move_to_end(key)
+                return await asyncio.shield(fut)
+            del self._data[key]
+
+        fut = asyncio.ensure_future(fetch())
+        self._data[key] = (now + self.ttl, fut)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        fut.add_done_callback(functools.partial(self._discard_unusable, key))
+        return await asyncio.shield(fut)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the cached entry for `key`, e.g. when new data arrives"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._data.clear()
+
+    def _discard_unusable(self, key: Hashable, fut: asyncio.Future) -> None:
+        """Evict the entry for `key` if its fetch failed or produced nothing"""
+        if fut.cancelled() or fut.exception() is not None or fut.result() is None:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] is fut:
+                del self._data[key]
+
+def cached_by_symbol(cache_attr: str):
+    """Cache an async `method(self, symbol)` in the AsyncTTLCache stored at `self.<cache_attr>`"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, symbol: str):
+            cache = getattr(self, cache_attr)
+            return await cache.get_or_fetch(symbol, lambda: func(self, symbol))
+        return wrapper
+    return decorator
@@ -0,0 +1,40 @@
+import numpy as np
+from numba import njit
+
+STATE_SIZE = 10  # Must match ReinforcementLearner.state_size
+
+
+@njit(cache=True, fastmath=True)
+def build_state(rsi, macd, volume, change_24h, trend, sentiment, sentiment_confidence,
+                volatility, volume_change, n_sources, out):
+    """Write the normalized RL state vector into `out` and return it"""
+    # Technical indicators (0-4)
+    out[0] = rsi * 0.01  # Normalize RSI
+    out[1] = macd
+    out[2] = volume * 1e-6  # Normalize volume
+    out[3] = change_24h * 0.01  # Normalize price change
+    out[4] = trend
+
+    # Sentiment features (5-6)
+    out[5] = sentiment
+    out[6] = sentiment_confidence
+
+    # Market volatility and volume metrics (7-9)
+    out[7] = volatility
+    out[8] = volume_change * 0.01
+    out[9] = n_sources * 0.1  # Normalize source count
+    return out
+
+
+@njit(cache=True)
+def traditional_score(rsi, macd, sentiment, confidence):
+    """Rule-based signal score without branches: +1 buy, -1 sell, 0 hold"""
+    confident = confidence > 0.75
+    bullish = (sentiment == 1.0) * ((rsi < 30.0) | (macd > 0.0))
+    bearish = (sentiment == -1.0) * ((rsi > 70.0) | (macd < 0.0))
+    return confident * (np.int64(bullish) - np.int64(bearish))
+
+
+# Warm up once at import so the first recommendation doesn't pay the JIT cost
+build_state(50.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, np.empty(STATE_SIZE, np.float32))
+traditional_score(50.0, 0.0, 0.0, 0.0)
@@ -0,0 +1,18 @@
+import time
+
+# (epoch second, formatted string) of the last call; swapped as one tuple so readers never see a torn pair
+_last_stamp = (-1, "")
+
+def iso_utc_now() -> str:
+    """Return the current UTC time as an ISO-8601 string at second resolution"""
+    global _last_stamp
+    now = int(time.time())
+    second, stamp = _last_stamp
+    if now != second:
+        g = time.gmtime(now)
+        stamp = (
+            f"{g.tm_year:04d}-{g.tm_mon:02d}-{g.tm_mday:02d}"
+            f"T{g.tm_hour:02d}:{g.tm_min:02d}:{g.tm_sec:02d}+00:00"
+        )
+        _last_stamp = (now, stamp)
+    return stamp
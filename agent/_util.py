@@ -0,0 +1,48 @@
+from typing import Any, Dict, Iterable, Optional
+from .models import SentimentType
+
+_SENTIMENT_LABELS = ("positive", "negative", "neutral")
+_VOTE_INDEX = {
+    "positive": 0,
+    "negative": 1,
+    "neutral": 2,
+    SentimentType.POSITIVE: 0,
+    SentimentType.NEGATIVE: 1,
+    SentimentType.NEUTRAL: 2
+}
+
+def aggregate_sentiment_list(items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-text sentiment results into one result in a single pass
+
+    The overall sentiment is a confidence-weighted vote; ties with neutral resolve to neutral.
+    """
+    n = 0
+    confidence_sum = 0.0
+    scores = [0.0, 0.0, 0.0]  # positive, negative, neutral
+    sources = set()
+    for s in items:
+        n += 1
+        confidence = s.get("confidence", 0.0)
+        confidence_sum += confidence
+        scores[_VOTE_INDEX.get(s.get("sentiment", "neutral"), 2)] += confidence
+        sources.update(s.get("sources", ()))
+
+    best = 2
+    if scores[0] > scores[best]:
+        best = 0
+    if scores[1] > scores[best]:
+        best = 1
+
+    return {
+        "sentiment": _SENTIMENT_LABELS[best],
+        "confidence": confidence_sum / n if n else 0.0,
+        "sources": list(sources)
+    }
+
+def normalize_sentiment(result: Any) -> Optional[Dict[str, Any]]:
+    """Normalize a SentimentAnalyzer result (a dict or a list of dicts) to a single dict"""
+    if not result:
+        return None
+    if isinstance(result, list):
+        return aggregate_sentiment_list(result)
+    return result
@@ -1,99 +1,137 @@
 import logging
 import asyncio
+import functools
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
-from .agent_config import AgentConfig
-from .models import TradeAnalysis, MarketData, TradingSignal, SentimentAnalysis, SentimentType
-from ai_model.sentiment_analysis import SentimentAnalyzer
-from ai_model.trade_analysis import TradeAnalyzer
-from ai_model.reinforcement import ReinforcementLearner
+from .agent_config import get_config
+from .models import TradeAnalysis, MarketData, MarketSnapshot, TradingSignal, SentimentAnalysis, SentimentType
+from ._cache import AsyncTTLCache, cached_by_symbol
+from .market_data import fetch_market_data
+from ._state_kernel import STATE_SIZE, build_state, traditional_score
+from ._util import normalize_sentiment
 
 logger = logging.getLogger(__name__)
 
+_TREND_MAP = {"up": 1.0, "down": -1.0, "neutral": 0.0}
+_SENTIMENT_MAP = {
+    "positive": 1.0,
+    "negative": -1.0,
+    "neutral": 0.0,
+    SentimentType.POSITIVE: 1.0,
+    SentimentType.NEGATIVE: -1.0,
+    SentimentType.NEUTRAL: 0.0
+}
+# Indexed by RL action: 0 = buy, 1 = sell, 2 = hold
+_SIGNAL_MAP = (TradingSignal.BUY, TradingSignal.SELL, TradingSignal.HOLD)
+# Indexed by traditional_score: 0 = hold, 1 = buy, -1 = sell
+_SCORE_SIGNALS = (TradingSignal.HOLD, TradingSignal.BUY, TradingSignal.SELL)
+
 class TradingAgent:
     def __init__(self):
         """Initialize the TradingAgent with required components"""
-        self.config = AgentConfig()
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.trade_analyzer = TradeAnalyzer()
-        self.rl_model = ReinforcementLearner()
-        logger.info(f"Initialized TradingAgent: {self.config.name}")
+        self.config = get_config()
+        self._state_buf = np.zeros(STATE_SIZE, dtype=np.float32)  # float32 to match the RL model
+        self._sent_inflight: Dict[str, asyncio.Future] = {}
+        self._sentiment_cache = AsyncTTLCache(ttl=self.config.sentiment_cache_ttl_s)
+        self._market_cache = AsyncTTLCache(ttl=self.config.market_cache_ttl_s)
+        logger.info("Initialized TradingAgent: %s", self.config.name)
+
+    @functools.cached_property
+    def sentiment_analyzer(self):
+        """Process-wide sentiment analyzer, imported on first use"""
+        from ai_model._singletons import shared_sentiment
+        return shared_sentiment()
+
+    @functools.cached_property
+    def trade_analyzer(self):
+        """Trade pattern analyzer, imported and constructed on first use"""
+        from ai_model.trade_analysis import TradeAnalyzer
+        return TradeAnalyzer()
+
+    @functools.cached_property
+    def rl_model(self):
+        """Reinforcement learning model, imported and constructed on first use"""
+        from ai_model.reinforcement import ReinforcementLearner
+        return ReinforcementLearner()
+
+    def invalidate(self, symbol: str) -> None:
+        """Flush cached sentiment and market analysis for a symbol"""
+        self._sentiment_cache.invalidate(symbol)
+        self._market_cache.invalidate(symbol)
 
-    async def analyze_sentiment(self, symbol: str) -> Optional[Dict[str, Any]]:
+    @cached_by_symbol("_sentiment_cache")
+    async def analyze_sentiment(self, symbol: str) -> Optional[SentimentAnalysis]:
         """Analyze sentiment for a given symbol"""
         try:
             # Get sentiment analysis from analyzer
-            sentiment_result = await self.sentiment_analyzer.analyze(symbol)
-            
+            sentiment_result = await self._sentiment(symbol)
             if not sentiment_result:
                 return None
 
-            # Handle list of sentiment results
-            if isinstance(sentiment_result, list):
-                if not sentiment_result:  # Empty list check
-                    return None
-                    
-                # Aggregate sentiment results without assuming 'source' key exists
-                sentiment_result = {
-                    'sentiment': max(s.get("sentiment", "neutral") for s in sentiment_result),
-                    'confidence': sum(s.get("confidence", 0.0) for s in sentiment_result) / len(sentiment_result),
-                    'sources': list(set(source for s in sentiment_result for source in s.get("sources", [])))
-                }
-
-            # Convert to proper format
-            return {
-                "symbol": symbol,
-                "sentiment": sentiment_result.get("sentiment", "neutral"),
-                "confidence": sentiment_result.get("confidence", 0.0),
-                "sources": sentiment_result.get("sources", []),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
+            return SentimentAnalysis(
+                symbol=symbol,
+                sentiment=SentimentType(sentiment_result.get("sentiment", "neutral")),
+                confidence=sentiment_result.get("confidence", 0.0),
+                sources=sentiment_result.get("sources", []),
+                timestamp=datetime.now(timezone.utc)
+            )
         except Exception as e:
-            logger.error(f"Error in sentiment analysis: {str(e)}")
+            logger.error("Error in sentiment analysis: %s", e)
             return None
 
-    async def analyze_market(self, symbol: str) -> Optional[Dict[str, Any]]:
+    @cached_by_symbol("_market_cache")
+    async def analyze_market(self, symbol: str) -> Optional[MarketSnapshot]:
         """Analyze market data for a given symbol"""
         try:
-            # Create a MarketData object with initial data
-            market_data = MarketData(
-                symbol=symbol,
-                price=0.0,  # These will be updated with real data
-                volume=0.0,
-                change_24h=0.0
-            )
-
-            # Get trade analysis
-            pattern_analysis = await self.trade_analyzer.analyze_pattern(market_data)
-            if not pattern_analysis:
-                raise ValueError(f"No pattern analysis available for {symbol}")
-
-            # Get sentiment analysis
-            sentiment_result = await self.sentiment_analyzer.analyze(symbol)
-            if isinstance(sentiment_result, list):
-                sentiment_result = {
-                    'sentiment': max(s.get("sentiment", "neutral") for s in sentiment_result),
-                    'confidence': sum(s.get("confidence", 0.0) for s in sentiment_result) / len(sentiment_result),
-                    'sources': list(set(source for s in sentiment_result for source in s.get("sources", [])))
-                }
+            pattern_analysis, sentiment_result = await self._fetch_pair(symbol)
             
-            # Get recommendation
-            recommendation = await self._generate_recommendation(pattern_analysis, sentiment_result)
+            # Get recommendation, skipping the RL model when there is no real market data to score
+            if self.config.skip_rl_on_empty and not self._has_market_data(pattern_analysis):
+                recommendation = await self._traditional_recommendation(pattern_analysis, sentiment_result)
+            else:
+                recommendation = await self._generate_recommendation(pattern_analysis, sentiment_result)
             
-            return {
-                "symbol": symbol,
-                "price": pattern_analysis.get("price", 0.0),
-                "change_24h": pattern_analysis.get("change_24h", 0.0),
-                "volume": pattern_analysis.get("volume", 0.0),
-                "sentiment": sentiment_result.get("sentiment", "neutral"),
-                "confidence": sentiment_result.get("confidence", 0.0),
-                "recommendation": recommendation.value.upper()  # Ensure uppercase string
-            }
+            return self._market_result(symbol, pattern_analysis, sentiment_result, recommendation)
         except Exception as e:
-            logger.error(f"Error in market analysis: {str(e)}")
+            logger.error("Error in market analysis: %s", e)
             return None
 
+    async def analyze_markets(self, symbols: List[str]) -> List[Optional[MarketSnapshot]]:
+        """Analyze several symbols, scoring them with one batched RL forward pass"""
+        pairs = await asyncio.gather(*(self._fetch_pair(s) for s in symbols), return_exceptions=True)
+        results: List[Optional[MarketSnapshot]] = [None] * len(symbols)
+
+        # Symbols without real market data take the rule-based path, the rest are batched
+        rl_rows = []
+        for i, (symbol, pair) in enumerate(zip(symbols, pairs)):
+            if isinstance(pair, Exception):
+                logger.error("Error in market analysis for %s: %s", symbol, pair)
+                continue
+            pattern_analysis, sentiment_result = pair
+            if self.config.skip_rl_on_empty and not self._has_market_data(pattern_analysis):
+                recommendation = await self._traditional_recommendation(pattern_analysis, sentiment_result)
+                results[i] = self._market_result(symbol, pattern_analysis, sentiment_result, recommendation)
+            else:
+                rl_rows.append(i)
+
+        if rl_rows:
+            states = np.empty((len(rl_rows), STATE_SIZE), np.float32)
+            for row, i in enumerate(rl_rows):
+                states[row] = self._prepare_state(*pairs[i])
+            actions = await self.rl_model.predict_actions(states)
+
+            for row, i in enumerate(rl_rows):
+                pattern_analysis, sentiment_result = pairs[i]
+                action = int(actions[row])
+                if 0 <= action < len(_SIGNAL_MAP):
+                    recommendation = _SIGNAL_MAP[action]
+                else:
+                    recommendation = await self._traditional_recommendation(pattern_analysis, sentiment_result)
+                results[i] = self._market_result(symbols[i], pattern_analysis, sentiment_result, recommendation)
+
+        return results
+
     async def generate_trade_signal(self, symbol: str) -> Optional[TradeAnalysis]:
         """Generate trading signals based on market analysis"""
         try:
@@ -101,62 +139,110 @@ class TradingAgent:
             if not market_data:
                 return None
 
-            # Convert string recommendation to TradingSignal enum
-            recommendation_str = market_data["recommendation"].upper()
-            recommendation = TradingSignal[recommendation_str]
-
             return TradeAnalysis(
                 timestamp=datetime.now(timezone.utc),
                 symbol=symbol,
-                recommendation=recommendation,  # Now passing TradingSignal enum
-                confidence=market_data["confidence"],
+                recommendation=market_data.recommendation,
+                confidence=market_data.confidence,
                 indicators=self._get_active_indicators(market_data)
             )
         except Exception as e:
-            logger.error(f"Error generating trade signal: {str(e)}")
+            logger.error("Error generating trade signal: %s", e)
             return None
 
+    @staticmethod
+    def _has_market_data(pattern_analysis: Dict[str, Any]) -> bool:
+        """Check whether pattern analysis carries any real (non-zero) market numerics"""
+        return any(pattern_analysis.get(k) for k in ("price", "volume", "rsi", "macd"))
+
+    async def get_market_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Fetch current market data for a symbol from Kraken"""
+        try:
+            return await fetch_market_data(symbol)
+        except Exception as e:
+            # A failed quote is treated as no quote, so analysis still runs on sentiment alone
+            logger.error("Error fetching market data for %s: %s", symbol, e)
+            return None
+
+    async def _fetch_pair(self, symbol: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Fetch market data and sentiment for a symbol concurrently, then run trade analysis"""
+        quote, sentiment_result = await asyncio.gather(
+            self.get_market_data(symbol),
+            self._sentiment(symbol)
+        )
+
+        # Without a quote, analysis falls back to empty data and the rule-based recommendation
+        if quote:
+            market_data = MarketData(
+                symbol=symbol,
+                price=quote["price"],
+                volume=quote["volume"],
+                change_24h=quote["change_24h"],
+                high_24h=quote.get("high"),
+                low_24h=quote.get("low")
+            )
+        else:
+            market_data = MarketData(symbol=symbol, price=0.0, volume=0.0, change_24h=0.0)
+
+        pattern_analysis = await self.trade_analyzer.analyze_pattern(market_data)
+        if not pattern_analysis:
+            raise ValueError(f"No pattern analysis available for {symbol}")
+        if not sentiment_result:
+            raise ValueError(f"No sentiment analysis available for {symbol}")
+        return pattern_analysis, sentiment_result
+
+    async def _analyze_sentiment_normalized(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Run the sentiment analyzer and normalize its result once at the source"""
+        return normalize_sentiment(await self.sentiment_analyzer.analyze(symbol))
+
+    @staticmethod
+    def _market_result(symbol: str, pattern_analysis: Dict[str, Any], sentiment_result: Dict[str, Any],
+                       recommendation: TradingSignal) -> MarketSnapshot:
+        """Assemble the market analysis result for a symbol"""
+        return MarketSnapshot(
+            symbol=symbol,
+            price=pattern_analysis.get("price", 0.0),
+            change_24h=pattern_analysis.get("change_24h", 0.0),
+            volume=pattern_analysis.get("volume", 0.0),
+            sentiment=SentimentType(sentiment_result.get("sentiment", "neutral")),
+            confidence=sentiment_result.get("confidence", 0.0),
+            recommendation=recommendation,
+            rsi=pattern_analysis.get("rsi"),
+            macd=pattern_analysis.get("macd", {}).get("value")
+        )
+
+    async def _sentiment(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Run sentiment analysis normalized to a single dict, sharing one in-flight call between overlapping callers"""
+        fut = self._sent_inflight.get(symbol)
+        if fut is not None:
+            return await asyncio.shield(fut)
+
+        fut = asyncio.ensure_future(self._analyze_sentiment_normalized(symbol))
+        self._sent_inflight[symbol] = fut
+        try:
+            # Shielded so one caller being cancelled doesn't cancel the shared call
+            return await asyncio.shield(fut)
+        finally:
+            self._sent_inflight.pop(symbol, None)
+
     def _prepare_state(self, pattern_analysis: Dict[str, Any], sentiment_result: Dict[str, Any]) -> np.ndarray:
-        """Prepare state vector for reinforcement learning model"""
-        state = np.zeros(10)  # Match the state_size in ReinforcementLearner
-        
-        # Technical indicators (0-4)
-        state[0] = float(pattern_analysis.get("rsi", 50.0)) / 100.0  # Normalize RSI
-        state[1] = float(pattern_analysis.get("macd", {}).get("value", 0.0))
-        state[2] = float(pattern_analysis.get("volume", 0.0)) / 1e6  # Normalize volume
-        state[3] = float(pattern_analysis.get("change_24h", 0.0)) / 100.0  # Normalize price change
-        
-        # Convert trend to numeric value
-        trend_map = {"up": 1.0, "down": -1.0, "neutral": 0.0}
-        trend = pattern_analysis.get("trend", "neutral")
-        state[4] = trend_map.get(trend, 0.0)
-
-        # Sentiment features (5-9)
-        # Convert sentiment to numeric values
-        sentiment = sentiment_result.get("sentiment", SentimentType.NEUTRAL)
-        # Handle both string and enum sentiment values
-        if isinstance(sentiment, str):
-            sentiment = sentiment.lower()
-        elif isinstance(sentiment, SentimentType):
-            sentiment = sentiment.value
-
-        sentiment_map = {
-            "positive": 1.0,
-            SentimentType.POSITIVE.value: 1.0,
-            "negative": -1.0,
-            SentimentType.NEGATIVE.value: -1.0,
-            "neutral": 0.0,
-            SentimentType.NEUTRAL.value: 0.0
-        }
-        state[5] = sentiment_map.get(sentiment, 0.0)  # Sentiment value
-        state[6] = float(sentiment_result.get("confidence", 0.0))  # Sentiment confidence
-        
-        # Market volatility and volume metrics
-        state[7] = float(pattern_analysis.get("volatility", 0.0))
-        state[8] = float(pattern_analysis.get("volume_change", 0.0)) / 100.0
-        state[9] = float(len(sentiment_result.get("sources", []))) / 10.0  # Normalize source count
-
-        return state
+        """Prepare state vector for reinforcement learning model
+
+        The returned array is a buffer reused across calls; copy it if it must outlive the next call.
+        """
+        return build_state(
+            float(pattern_analysis.get("rsi", 50.0)),
+            float(pattern_analysis.get("macd", {}).get("value", 0.0)),
+            float(pattern_analysis.get("volume", 0.0)),
+            float(pattern_analysis.get("change_24h", 0.0)),
+            _TREND_MAP.get(pattern_analysis.get("trend", "neutral"), 0.0),
+            _SENTIMENT_MAP.get(sentiment_result.get("sentiment", SentimentType.NEUTRAL), 0.0),
+            float(sentiment_result.get("confidence", 0.0)),
+            float(pattern_analysis.get("volatility", 0.0)),
+            float(pattern_analysis.get("volume_change", 0.0)),
+            float(len(sentiment_result.get("sources", []))),
+            self._state_buf
+        )
 
     async def _generate_recommendation(self, pattern_analysis: Dict[str, Any], sentiment_result: Dict[str, Any]) -> TradingSignal:
         """Generate trading recommendation using reinforcement learning model"""
@@ -167,48 +253,32 @@ class TradingAgent:
             # Get action from RL model
             action = await self.rl_model.predict_action(state)
             
-            # Convert action to TradingSignal
-            signal_map = {
-                0: TradingSignal.BUY,
-                1: TradingSignal.SELL,
-                2: TradingSignal.HOLD
-            }
-            
             # Use traditional logic as fallback
-            if action not in signal_map:
+            if not 0 <= action < len(_SIGNAL_MAP):
                 return await self._traditional_recommendation(pattern_analysis, sentiment_result)
                 
-            return signal_map[action]
+            return _SIGNAL_MAP[action]
             
         except Exception as e:
-            logger.error(f"Error in RL recommendation: {str(e)}")
+            logger.error("Error in RL recommendation: %s", e)
             # Fallback to traditional recommendation
             return await self._traditional_recommendation(pattern_analysis, sentiment_result)
 
     async def _traditional_recommendation(self, pattern_analysis: Dict[str, Any], sentiment_result: Dict[str, Any]) -> TradingSignal:
         """Traditional rule-based recommendation as fallback"""
-        sentiment = sentiment_result.get("sentiment", "neutral")
-        confidence = sentiment_result.get("confidence", 0.0)
-
-        if confidence > 0.75 and sentiment == "positive":
-            if pattern_analysis.get("rsi", 50) < 30:
-                return TradingSignal.BUY
-            if pattern_analysis.get("macd", {}).get("value", 0) > 0:
-                return TradingSignal.BUY
-
-        elif confidence > 0.75 and sentiment == "negative":
-            if pattern_analysis.get("rsi", 50) > 70:
-                return TradingSignal.SELL
-            if pattern_analysis.get("macd", {}).get("value", 0) < 0:
-                return TradingSignal.SELL
-
-        return TradingSignal.HOLD
+        score = traditional_score(
+            float(pattern_analysis.get("rsi", 50.0)),
+            float(pattern_analysis.get("macd", {}).get("value", 0.0)),
+            _SENTIMENT_MAP.get(sentiment_result.get("sentiment", "neutral"), 0.0),
+            float(sentiment_result.get("confidence", 0.0))
+        )
+        return _SCORE_SIGNALS[score]
 
-    def _get_active_indicators(self, market_data: Dict[str, Any]) -> list:
+    def _get_active_indicators(self, market_data: MarketSnapshot) -> list:
         """Get list of active technical indicators"""
         indicators = []
-        if market_data.get("rsi"):
-            indicators.append(f"RSI: {market_data['rsi']}")
-        if market_data.get("macd"):
-            indicators.append(f"MACD: {market_data['macd']}")
+        if market_data.rsi:
+            indicators.append(f"RSI: {market_data.rsi}")
+        if market_data.macd:
+            indicators.append(f"MACD: {market_data.macd}")
         return indicators if indicators else ['No significant indicators']
\ No newline at end of file
@@ -1,10 +1,11 @@
 from dataclasses import dataclass
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentConfig:
     """Configuration settings for the TradingAgent"""
     name: str = "TradeMateAI"
@@ -21,14 +22,24 @@ class AgentConfig:
     max_position_size: float = 1.0
     stop_loss_percent: float = 0.02
     take_profit_percent: float = 0.05
+    skip_rl_on_empty: bool = True  # Use rule-based signals when there is no market data
     
     # Rate Limiting
     max_requests_per_min: int = 60
     request_timeout: int = 30
 
+    # Result Caching
+    sentiment_cache_ttl_s: float = 300.0
+    market_cache_ttl_s: float = 60.0
+
     def __post_init__(self):
         """Validate configuration after initialization"""
         if not self.openserv_api_key:
             raise ValueError("OPENSERV_API_KEY not found in environment variables")
         if not self.gemini_api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables") 
\ No newline at end of file
+            raise ValueError("GEMINI_API_KEY not found in environment variables")
+
+@lru_cache(maxsize=1)
+def get_config() -> AgentConfig:
+    """Get cached process-wide configuration instance"""
+    return AgentConfig()
@@ -0,0 +1,110 @@
+import logging
+import aiohttp
+import orjson
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional
+from config.settings import settings
+from ._cache import AsyncTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Shared HTTP session so Kraken connections are pooled and reused across bot commands and API requests
+_session: Optional[aiohttp.ClientSession] = None
+
+# Converted Kraken ticker data per pair; concurrent misses share one request, failures aren't kept
+_ticker_cache = AsyncTTLCache(ttl=settings.TICKER_TTL_SECONDS)
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it inside the running event loop on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=settings.REQUEST_TIMEOUT)
+        )
+    return _session
+
+async def close_session():
+    """Close the shared client session"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+# Common names mapped to Kraken pairs; read-only and built once at import
+_SYMBOL_MAP = MappingProxyType({
+    'BTCUSD': 'XBTUSD',
+    'BTCEUR': 'XBTEUR',
+    'ETHUSD': 'XETHUSD',
+    'ETHEUR': 'XETHZEUR',
+    'XRPUSD': 'XXRPUSD',
+    'XRPETH': 'XXRPETH',
+    'SOLUSD': 'SOLUSD',
+    'SOLUSDT': 'SOLUSDT',
+    'SOLBTC': 'SOLBTC',
+    'SOLXRP': 'SOLXRP',
+    'SOLETH': 'SOLETH',
+    'SOLJPY': 'SOLJPY',
+})
+
+def format_kraken_symbol(symbol: str) -> str:
+    """Convert common symbol format to Kraken format"""
+    # Remove '/' if present and convert to uppercase
+    clean_symbol = symbol.replace('/', '').upper()
+    return _SYMBOL_MAP.get(clean_symbol, clean_symbol)
+
+@lru_cache(maxsize=256)
+def _ticker_url(kraken_symbol: str) -> str:
+    """Kraken ticker URL for a pair, built once per pair"""
+    return f"{settings.API_BASE_URL_KRAKEN}/public/Ticker?pair={kraken_symbol}"
+
+async def _request_ticker(kraken_symbol: str) -> Optional[Dict[str, Any]]:
+    """Request ticker data for a Kraken pair, converted to the market data fields"""
+    session = await get_session()
+    async with session.get(_ticker_url(kraken_symbol)) as response:
+        if response.status != 200:
+            logger.error("Kraken API error: Status %s", response.status)
+            return None
+
+        data = orjson.loads(await response.read())
+        if data.get("error"):
+            logger.error("Kraken API error: %s", data['error'])
+            return None
+            
+        result = data.get("result", {})
+        if not result:
+            logger.error("No data in Kraken response")
+            return None
+            
+        # Get the first (and usually only) ticker data
+        ticker_data = next(iter(result.values()))
+        price = float(ticker_data["c"][0])  # Current price
+        # "p" is the volume-weighted average price, so the change is taken against today's opening price
+        opening = float(ticker_data["o"])
+        return {
+            "price": price,
+            "change_24h": (price - opening) / opening * 100 if opening else 0.0,  # 24h price change, percent
+            "volume": float(ticker_data["v"][1]),  # 24h volume
+            "high": float(ticker_data["h"][1]),  # 24h high
+            "low": float(ticker_data["l"][1]),  # 24h low
+            "timestamp": datetime.now().timestamp()
+        }
+
+async def _get_ticker(kraken_symbol: str) -> Optional[Dict[str, Any]]:
+    """Return ticker data for a Kraken pair, requesting it at most once per TICKER_TTL_SECONDS"""
+    return await _ticker_cache.get_or_fetch(kraken_symbol, lambda: _request_ticker(kraken_symbol))
+
+async def fetch_market_data(symbol: str) -> Optional[Dict[str, Any]]:
+    """Fetch real-time market data from Kraken"""
+    try:
+        ticker = await _get_ticker(format_kraken_symbol(symbol))
+        if ticker is None:
+            return None
+
+        # A fresh dict per caller, so the cached entry is never mutated and each caller keeps its own symbol
+        return {"symbol": symbol, **ticker}
+    except Exception as e:
+        logger.error("Error fetching market data from Kraken: %s", e)
+        return None
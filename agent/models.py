@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from enum import Enum
+import orjson
 
 class TradingSignal(Enum):
     BUY = "buy"
@@ -13,7 +14,7 @@ class SentimentType(Enum):
     NEGATIVE = "negative"
     NEUTRAL = "neutral"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeAnalysis:
     timestamp: datetime
     symbol: str
@@ -31,7 +32,17 @@ class TradeAnalysis:
             "indicators": self.indicators
         }
 
-@dataclass
+    def to_json(self) -> bytes:
+        """Serialize analysis to JSON bytes"""
+        return orjson.dumps({
+            "timestamp": self.timestamp,
+            "symbol": self.symbol,
+            "recommendation": self.recommendation.value,
+            "confidence": self.confidence,
+            "indicators": self.indicators
+        }, option=orjson.OPT_UTC_Z)
+
+@dataclass(slots=True, frozen=True)
 class MarketData:
     symbol: str
     price: float
@@ -41,14 +52,50 @@ class MarketData:
     low_24h: Optional[float] = None
     market_cap: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SentimentAnalysis:
     symbol: str
     sentiment: SentimentType
     confidence: float
     sources: List[str]
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
     def __post_init__(self):
         if not (0.0 <= self.confidence <= 1.0):
             raise ValueError("Confidence must be between 0.0 and 1.0")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert sentiment analysis to dictionary format"""
+        return {
+            "symbol": self.symbol,
+            "sentiment": self.sentiment.value,
+            "confidence": self.confidence,
+            "sources": self.sources,
+            "timestamp": self.timestamp.isoformat()
+        }
+
+@dataclass(slots=True, frozen=True)
+class MarketSnapshot:
+    symbol: str
+    price: float
+    change_24h: float
+    volume: float
+    sentiment: SentimentType
+    confidence: float
+    recommendation: TradingSignal
+    rsi: Optional[float] = None
+    macd: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert market snapshot to dictionary format"""
+        return {
+            "symbol": self.symbol,
+            "price": self.price,
+            "change_24h": self.change_24h,
+            "volume": self.volume,
+            "sentiment": self.sentiment.value,
+            "confidence": self.confidence,
+            "recommendation": self.recommendation.value,
+            "rsi": self.rsi,
+            "macd": self.macd
+        }
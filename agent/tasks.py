@@ -1,7 +1,9 @@
 from typing import Dict, Any, Optional
 import logging
-from datetime import datetime
-from .models import TradeAnalysis, MarketData, SentimentAnalysis
+from datetime import datetime, timezone
+from .models import MarketData, SentimentAnalysis, SentimentType
+from ._time import iso_utc_now
+from ._util import normalize_sentiment
 from ai_model.sentiment_analysis import SentimentAnalyzer
 from ai_model.trade_analysis import TradeAnalyzer
 
@@ -15,15 +17,18 @@ class AgentTasks:
     async def analyze_sentiment(self, symbol: str) -> Optional[SentimentAnalysis]:
         """Analyze market sentiment for a given symbol"""
         try:
-            result = await self.sentiment_analyzer.analyze(symbol)
+            result = normalize_sentiment(await self.sentiment_analyzer.analyze(symbol))
+            if not result:
+                return None
+
             return SentimentAnalysis(
                 symbol=symbol,
-                sentiment=result["sentiment"],
+                sentiment=SentimentType(result["sentiment"]),
                 confidence=result["confidence"],
                 sources=result["sources"]
             )
         except Exception as e:
-            logger.error(f"Error in sentiment analysis: {str(e)}")
+            logger.error("Error in sentiment analysis: %s", e)
             return None
 
     async def analyze_trade_pattern(self, market_data: MarketData) -> Optional[Dict[str, Any]]:
@@ -35,10 +40,10 @@ class AgentTasks:
             return {
                 "patterns": patterns,
                 "signals": signals,
-                "timestamp": datetime.now()
+                "timestamp": datetime.now(timezone.utc)
             }
         except Exception as e:
-            logger.error(f"Error in trade pattern analysis: {str(e)}")
+            logger.error("Error in trade pattern analysis: %s", e)
             return None
 
     async def process_market_update(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -53,8 +58,8 @@ class AgentTasks:
                 "symbol": symbol,
                 "sentiment": sentiment.sentiment.value,
                 "confidence": sentiment.confidence,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_utc_now()
             }
         except Exception as e:
-            logger.error(f"Error processing market update: {str(e)}")
+            logger.error("Error processing market update: %s", e)
             return None 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import numpy as np
+from numba import njit
+
+# fastmath is left off: these are serial recurrences that gain nothing from it, and the outputs use NaN
+# to mark warm-up periods, which fastmath is allowed to assume away.
+
+@njit(cache=True)
+def ema(prices, span):
+    """Exponential moving average seeded with the first price (pandas ewm adjust=False)"""
+    alpha = 2.0 / (span + 1)
+    out = np.empty_like(prices)
+    out[0] = prices[0]
+    for i in range(1, len(prices)):
+        out[i] = alpha * prices[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+@njit(cache=True)
+def _rsi_value(avg_gain, avg_loss):
+    """RSI from average gain/loss; a flat series reads as neutral"""
+    if avg_loss == 0.0:
+        return 100.0 if avg_gain > 0.0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True)
+def rsi_wilder(prices, n):
+    """Relative Strength Index with Wilder's smoothing; NaN until `n` changes are available"""
+    out = np.full(len(prices), np.nan)
+    if len(prices) <= n:
+        return out
+
+    # Seed with simple averages over the first n changes
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n + 1):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0.0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= n
+    avg_loss /= n
+    out[n] = _rsi_value(avg_gain, avg_loss)
+
+    for i in range(n + 1, len(prices)):
+        delta = prices[i] - prices[i - 1]
+        avg_gain = (avg_gain * (n - 1) + max(delta, 0.0)) / n
+        avg_loss = (avg_loss * (n - 1) + max(-delta, 0.0)) / n
+        out[i] = _rsi_value(avg_gain, avg_loss)
+    return out
+
+
+@njit(cache=True)
+def rolling_mean_std(prices, n):
+    """Rolling mean and sample standard deviation (ddof=1); NaN until a full window is available"""
+    size = len(prices)
+    mean = np.full(size, np.nan)
+    std = np.full(size, np.nan)
+    for end in range(n, size + 1):
+        total = 0.0
+        for i in range(end - n, end):
+            total += prices[i]
+        m = total / n
+        sq = 0.0
+        for i in range(end - n, end):
+            d = prices[i] - m
+            sq += d * d
+        mean[end - 1] = m
+        std[end - 1] = np.sqrt(sq / (n - 1)) if n > 1 else 0.0
+    return mean, std
+
+
+# Warm up once at import so the first analysis doesn't pay the JIT cost
+_warmup = np.zeros(30, dtype=np.float64)
+ema(_warmup, 12)
+rsi_wilder(_warmup, 14)
+rolling_mean_std(_warmup, 20)
+del _warmup
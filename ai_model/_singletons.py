@@ -0,0 +1,23 @@
+import asyncio
+from typing import Optional
+from .sentiment_analysis import BatchedSentimentAnalyzer
+
+# One FinBERT instance per process, shared by the API and the trading agent
+SENTIMENT: Optional[BatchedSentimentAnalyzer] = None
+_sentiment_lock = asyncio.Lock()
+
+def shared_sentiment() -> BatchedSentimentAnalyzer:
+    """Return the shared sentiment analyzer, constructing it (without loading the model) if needed"""
+    global SENTIMENT
+    if SENTIMENT is None:
+        SENTIMENT = BatchedSentimentAnalyzer()
+    return SENTIMENT
+
+async def get_sentiment() -> BatchedSentimentAnalyzer:
+    """Return the shared sentiment analyzer with its model loaded exactly once"""
+    analyzer = shared_sentiment()
+    if analyzer.model is None:
+        async with _sentiment_lock:
+            if analyzer.model is None:
+                await analyzer.initialize()
+    return analyzer
@@ -0,0 +1,22 @@
+import logging
+from transformers import AutoTokenizer
+from .utils import load_model_config
+
+logger = logging.getLogger(__name__)
+
+def export_sentiment_model() -> str:
+    """Export FinBERT to ONNX for the ONNX Runtime backend of SentimentAnalyzer"""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    config = load_model_config()
+    model_path = config["sentiment_model_path"]
+    output_dir = config["sentiment_onnx_dir"]
+
+    model = ORTModelForSequenceClassification.from_pretrained(model_path, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_path).save_pretrained(output_dir)
+    return output_dir
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"Sentiment model exported to {export_sentiment_model()}")
@@ -4,7 +4,6 @@ from typing import Dict, Any, List, Tuple
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from collections import deque
 import random
 
 logger = logging.getLogger(__name__)
@@ -21,6 +20,47 @@ class DQNNetwork(nn.Module):
         x = torch.relu(self.fc2(x))
         return self.fc3(x)
 
+class ReplayBuffer:
+    """Experience replay ring buffer kept on the training device so sampling needs no host copies"""
+
+    def __init__(self, capacity: int, state_size: int, device: torch.device):
+        self.capacity = capacity
+        self.device = device
+        self.states = torch.empty((capacity, state_size), device=device)
+        self.next_states = torch.empty((capacity, state_size), device=device)
+        self.actions = torch.empty(capacity, dtype=torch.long, device=device)
+        self.rewards = torch.empty(capacity, device=device)
+        self.pos = 0  # Next write index
+        self.size = 0  # Number of stored experiences
+        # Pinned staging for incoming transitions: state and next_state reach the device in one async copy
+        pin = device.type == "cuda"
+        self._pin_transition = torch.empty((2, state_size), pin_memory=pin)
+        self._h2d_done = torch.cuda.Event() if pin else None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray):
+        """Store one experience, overwriting the oldest once full"""
+        if self._h2d_done is not None:
+            self._h2d_done.synchronize()  # The previous copy must finish before the staging is reused
+        self._pin_transition[0].copy_(torch.from_numpy(np.asarray(state, dtype=np.float32)))
+        self._pin_transition[1].copy_(torch.from_numpy(np.asarray(next_state, dtype=np.float32)))
+        transition = self._pin_transition.to(self.device, non_blocking=True)
+        if self._h2d_done is not None:
+            self._h2d_done.record()
+        self.states[self.pos] = transition[0]
+        self.next_states[self.pos] = transition[1]
+        self.actions[self.pos] = action
+        self.rewards[self.pos] = reward
+        self.pos = (self.pos + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Sample a random batch (states, actions, rewards, next_states) with one on-device gather each"""
+        idx = torch.randint(0, self.size, (batch_size,), device=self.device)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx]
+
 class ReinforcementLearner:
     def __init__(self):
         """Initialize the reinforcement learning model"""
@@ -35,14 +75,39 @@ class ReinforcementLearner:
         self.epsilon_decay = 0.995
         self.learning_rate = 0.001
         self.batch_size = 32
+        self.target_update_interval = 100  # Training steps between target network syncs
+        self._step = 0
         
         # Initialize networks
         self.policy_net = DQNNetwork(self.state_size, self.action_size).to(self.device)
         self.target_net = DQNNetwork(self.state_size, self.action_size).to(self.device)
         self.target_net.load_state_dict(self.policy_net.state_dict())
+
+        # Compiled forward passes replayed as CUDA graphs; the plain modules stay the source of truth for
+        # state dicts and the optimizer so checkpoints keep their keys
+        if self.device.type == "cuda":
+            self._policy_fwd = torch.compile(self.policy_net, mode="reduce-overhead", fullgraph=True)
+            self._target_fwd = torch.compile(self.target_net, mode="reduce-overhead", fullgraph=True)
+        else:
+            self._policy_fwd = self.policy_net
+            self._target_fwd = self.target_net
+        # Fixed-shape input for predict_action so the captured graph can be replayed
+        self._state_scratch = torch.zeros((1, self.state_size), device=self.device)
+        self._action_graph = self._capture_action_graph() if self.device.type == "cuda" else None
+        # Row indices for picking each sampled action's Q value without gather/unsqueeze
+        self._ar = torch.arange(self.batch_size, device=self.device)
         
         self.optimizer = optim.Adam(self.policy_net.parameters(), lr=self.learning_rate)
-        self.memory = deque(maxlen=10000)
+        self.mse = nn.MSELoss()
+        # bf16 autocast on CUDA; bf16 keeps the FP32 exponent range so no GradScaler is needed
+        self.use_amp = self.device.type == "cuda"
+
+        # Experience replay memory
+        self.memory = ReplayBuffer(10000, self.state_size, self.device)
+
+        # Training loss accumulated on-device; read back only in flush_metrics to avoid a sync per step
+        self._loss_sum = torch.zeros((), device=self.device)
+        self._loss_steps = 0
         
         logger.info("Reinforcement learning model initialized")
 
@@ -50,40 +115,40 @@ class ReinforcementLearner:
         """Train the model with new experience"""
         try:
             # Store experience in memory
-            self.memory.append((state, action, reward, next_state))
+            self.memory.append(state, action, reward, next_state)
             
             # Start training only if we have enough samples
             if len(self.memory) < self.batch_size:
                 return
             
-            # Sample random batch from memory
-            batch = random.sample(self.memory, self.batch_size)
-            states, actions, rewards, next_states = zip(*batch)
-            
-            # Convert to tensors
-            states = torch.FloatTensor(states).to(self.device)
-            actions = torch.LongTensor(actions).to(self.device)
-            rewards = torch.FloatTensor(rewards).to(self.device)
-            next_states = torch.FloatTensor(next_states).to(self.device)
-            
-            # Get current Q values
-            current_q = self.policy_net(states).gather(1, actions.unsqueeze(1))
+            # Sample random batch from memory on-device
+            states, actions, rewards, next_states = self.memory.sample(self.batch_size)
             
-            # Get next Q values
-            with torch.no_grad():
-                next_q = self.target_net(next_states).max(1)[0]
-            
-            # Calculate target Q values
-            target_q = rewards + self.gamma * next_q
-            
-            # Calculate loss and update policy network
-            loss = nn.MSELoss()(current_q.squeeze(), target_q)
-            self.optimizer.zero_grad()
+            with torch.autocast(device_type=self.device.type, dtype=torch.bfloat16, enabled=self.use_amp):
+                # Get current Q values
+                current_q = self._policy_fwd(states)[self._ar, actions]
+                
+                # Get next Q values
+                with torch.inference_mode():
+                    next_q = self._target_fwd(next_states).amax(1)
+                
+                # Calculate target Q values outside inference mode so the result can be saved for backward
+                target_q = rewards + self.gamma * next_q
+                
+                # Calculate loss
+                loss = self.mse(current_q, target_q)
+
+            # Update policy network outside autocast
+            self.optimizer.zero_grad(set_to_none=True)
             loss.backward()
             self.optimizer.step()
+            self._loss_sum += loss.detach()
+            self._loss_steps += 1
             
             # Update target network periodically
-            self._update_target_network()
+            self._step += 1
+            if self._step % self.target_update_interval == 0:
+                self._update_target_network()
             
             # Decay epsilon
             self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
@@ -97,15 +162,62 @@ class ReinforcementLearner:
             if random.random() < self.epsilon:
                 return random.randrange(self.action_size)
             
-            with torch.no_grad():
-                state_tensor = torch.FloatTensor(state).unsqueeze(0).to(self.device)
-                q_values = self.policy_net(state_tensor)
+            with torch.inference_mode():
+                # float32 states are used as-is, without a cast or copy on CPU
+                self._state_scratch.copy_(torch.as_tensor(state, dtype=torch.float32), non_blocking=True)
+                if self._action_graph is not None:
+                    self._action_graph.replay()
+                    return int(self._action_out.item())
+                q_values = self.policy_net(self._state_scratch)
                 return q_values.argmax().item()
                 
         except Exception as e:
             logger.error(f"Error in action prediction: {str(e)}")
             return 2  # Default to HOLD action
 
+    async def predict_actions(self, states: np.ndarray) -> np.ndarray:
+        """Predict actions for a batch of states of shape (N, state_size) in one forward pass"""
+        try:
+            with torch.inference_mode():
+                states_tensor = torch.from_numpy(np.ascontiguousarray(states, dtype=np.float32)).to(self.device)
+                # Eager module: batch sizes vary, so the compiled graph would recompile per shape
+                actions = self.policy_net(states_tensor).argmax(dim=1).cpu().numpy()
+
+            # Epsilon-greedy exploration per state, as in predict_action
+            explore = np.random.random(len(actions)) < self.epsilon
+            actions[explore] = np.random.randint(0, self.action_size, int(explore.sum()))
+            return actions
+
+        except Exception as e:
+            logger.error(f"Error in batched action prediction: {str(e)}")
+            return np.full(len(states), 2, dtype=np.int64)  # Default to HOLD action
+
+    def _capture_action_graph(self) -> "torch.cuda.CUDAGraph":
+        """Capture policy forward + argmax on the static input as a CUDA graph
+
+        The graph reads the policy parameters in place, so optimizer steps and checkpoint loads are picked up.
+        """
+        # Warm up on a side stream so lazy initialization isn't recorded into the graph
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream), torch.inference_mode():
+            for _ in range(3):
+                self.policy_net(self._state_scratch)
+        torch.cuda.current_stream().wait_stream(stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph), torch.inference_mode():
+            self._action_out = self.policy_net(self._state_scratch).argmax(dim=1)
+        return graph
+
+    def flush_metrics(self) -> Dict[str, Any]:
+        """Return the mean training loss since the last flush and reset the accumulator"""
+        steps = self._loss_steps
+        mean_loss = float(self._loss_sum) / steps if steps else 0.0
+        self._loss_sum.zero_()
+        self._loss_steps = 0
+        return {"loss": mean_loss, "steps": steps, "epsilon": self.epsilon}
+
     def _update_target_network(self):
         """Update target network weights"""
         self.target_net.load_state_dict(self.policy_net.state_dict())
@@ -118,7 +230,7 @@ class ReinforcementLearner:
                 'target_net_state_dict': self.target_net.state_dict(),
                 'optimizer_state_dict': self.optimizer.state_dict(),
                 'epsilon': self.epsilon
-            }, path)
+            }, path, _use_new_zipfile_serialization=True)  # Zip format is required for mmap loading
             logger.info(f"Model saved to {path}")
         except Exception as e:
             logger.error(f"Error saving model: {str(e)}")
@@ -126,9 +238,10 @@ class ReinforcementLearner:
     def load_model(self, path: str):
         """Load model weights"""
         try:
-            checkpoint = torch.load(path)
-            self.policy_net.load_state_dict(checkpoint['policy_net_state_dict'])
-            self.target_net.load_state_dict(checkpoint['target_net_state_dict'])
+            # Map tensors straight to the model device; weights_only refuses arbitrary pickled objects
+            checkpoint = torch.load(path, map_location=self.device, weights_only=True, mmap=True)
+            self.policy_net.load_state_dict(checkpoint['policy_net_state_dict'], strict=True)
+            self.target_net.load_state_dict(checkpoint['target_net_state_dict'], strict=True)
             self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
             self.epsilon = checkpoint['epsilon']
             logger.info(f"Model loaded from {path}")
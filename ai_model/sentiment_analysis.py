@@ -1,42 +1,111 @@
 import logging
+import asyncio
+import importlib.util
+from pathlib import Path
 import torch
-from typing import Dict, Any, List
-from transformers import pipeline
+from typing import Dict, Any, List, Optional, Tuple, Union
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, BitsAndBytesConfig
 from agent.models import SentimentType
+from .utils import load_model_config
 
 logger = logging.getLogger(__name__)
 
+# bitsandbytes is optional; without it GPU deploys keep the bf16 weights. Loading with quantization_config
+# and device_map also needs accelerate, so both must be installed
+_HAS_BITSANDBYTES = (
+    importlib.util.find_spec("bitsandbytes") is not None
+    and importlib.util.find_spec("accelerate") is not None
+)
+# optimum[onnxruntime] is optional; the ONNX backend is used only when an exported model exists
+_HAS_OPTIMUM = importlib.util.find_spec("optimum") is not None
+
 class SentimentAnalyzer:
     def __init__(self):
         """Initialize sentiment analysis components"""
         self.model = None
+        self.tokenizer = None
+        self.id2label = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
     async def initialize(self):
         """Load the FinBERT model asynchronously"""
         try:
-            self.model = pipeline(
-                "sentiment-analysis",
-                model="ProsusAI/finbert",
-                device=0 if torch.cuda.is_available() else -1
-            )
+            # from_pretrained blocks for seconds, so it runs off the event loop
+            await asyncio.to_thread(self._load_model)
             logger.info("Sentiment analysis model initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing sentiment model: {str(e)}")
             raise
 
-    async def analyze(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """Analyze sentiment of a list of texts"""
+    def _load_model(self):
+        """Load the tokenizer and model for this host; blocking"""
+        model_name = "ProsusAI/finbert"
+        use_cuda = self.device.type == "cuda"
+        onnx_dir = Path(load_model_config()["sentiment_onnx_dir"])
+        if _HAS_OPTIMUM and onnx_dir.is_dir():
+            # FinBERT exported by `python -m ai_model.export_onnx`, served by ONNX Runtime
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            # The CPU onnxruntime build has no CUDA provider; fall back to CPU and keep the inputs there
+            if use_cuda and "CUDAExecutionProvider" not in onnxruntime.get_available_providers():
+                use_cuda = False
+                self.device = torch.device("cpu")
+            self.tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+            model = ORTModelForSequenceClassification.from_pretrained(
+                onnx_dir,
+                provider="CUDAExecutionProvider" if use_cuda else "CPUExecutionProvider"
+            )
+        elif use_cuda and _HAS_BITSANDBYTES:
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            # int8 weights via bitsandbytes; quantized models are placed by device_map, not .to()
+            model = AutoModelForSequenceClassification.from_pretrained(
+                model_name,
+                quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                torch_dtype=torch.bfloat16,
+                device_map={"": self.device.index or 0}
+            ).eval()
+        else:
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModelForSequenceClassification.from_pretrained(
+                model_name,
+                torch_dtype=torch.bfloat16 if use_cuda else torch.float32
+            ).to(self.device).eval()
+            if not use_cuda:
+                # Dynamic int8 quantization of the Linear layers for CPU inference
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        # Label names indexed by class id, lowercased once
+        config_labels = model.config.id2label
+        self.id2label = [config_labels[i].lower() for i in range(len(config_labels))]
+        self.model = model
+
+    async def analyze(self, texts: Union[str, List[str]]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Analyze sentiment of a text or a list of texts; a single text yields a single result"""
+        # A single string goes through the same batched path and is unwrapped at the end
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
         try:
             if not self.model:
                 await self.initialize()
 
-            # Ensure input is a list (single string wrapped in a list)
-            if isinstance(texts, str):
-                texts = [texts]
-
-            # Process in chunks if text is too long
-            results = self.model(texts)
+            # Tokenize and score the whole batch in a single forward pass
+            encoded = self.tokenizer(
+                texts,
+                padding=True,
+                truncation=True,
+                return_tensors="pt"
+            ).to(self.device)
+            with torch.inference_mode(), torch.autocast(
+                device_type=self.device.type,
+                dtype=torch.bfloat16,
+                enabled=self.device.type == "cuda"
+            ):
+                logits = self.model(**encoded).logits.float()
+            probs = logits.softmax(dim=-1)
+            scores, label_ids = probs.max(dim=-1)
+            scores = scores.cpu().tolist()
+            label_ids = label_ids.cpu().tolist()
 
             # Convert results into structured response
             sentiment_mapping = {
@@ -45,20 +114,21 @@ class SentimentAnalyzer:
                 'neutral': SentimentType.NEUTRAL
             }
 
-            return [
-                {
+            results = []
+            for text, score, label_id in zip(texts, scores, label_ids):
+                label = self.id2label[label_id]
+                results.append({
                     'text': text,
-                    'sentiment': sentiment_mapping.get(res['label'].lower(), SentimentType.NEUTRAL),
-                    'confidence': res['score'],
+                    'sentiment': sentiment_mapping.get(label, SentimentType.NEUTRAL),
+                    'confidence': score,
                     'sources': ['FinBERT Analysis'],
-                    'raw_score': self._normalize_sentiment_score(res['score'], res['label'])
-                }
-                for text, res in zip(texts, results)
-            ]
+                    'raw_score': self._normalize_sentiment_score(score, label)
+                })
+            return results[0] if single else results
 
         except Exception as e:
             logger.error(f"Error in sentiment analysis: {str(e)}")
-            return [
+            results = [
                 {
                     'text': text,
                     'sentiment': SentimentType.NEUTRAL,
@@ -68,6 +138,7 @@ class SentimentAnalyzer:
                 }
                 for text in texts
             ]
+            return results[0] if single else results
 
     def _normalize_sentiment_score(self, confidence: float, label: str) -> float:
         """Normalize sentiment score to range [-1, 1]"""
@@ -76,3 +147,82 @@ class SentimentAnalyzer:
         elif label.lower() == 'positive':
             return confidence
         return 0.0
+
+class BatchedSentimentAnalyzer(SentimentAnalyzer):
+    """SentimentAnalyzer that micro-batches concurrent single-text requests into one forward pass"""
+
+    def __init__(self, max_batch: int = 32, max_wait: float = 0.005):
+        super().__init__()
+        self.max_batch = max_batch
+        self.max_wait = max_wait  # Seconds to wait for more requests after the first one arrives
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
+
+    async def analyze_one(self, text: str) -> Dict[str, Any]:
+        """Analyze a single text, batched with other concurrent callers"""
+        if not self.model:
+            await self.initialize()
+        self._start_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def close(self):
+        """Stop the batching worker and fail any requests still waiting for it"""
+        if self._worker_task is not None:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+
+        if self._queue is not None:
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._fail(pending, RuntimeError("Sentiment analyzer closed"))
+
+    def _start_worker(self):
+        """Start the batching worker if it isn't running; the model must already be loaded"""
+        if self._worker_task is None or self._worker_task.done():
+            # Keep an existing queue so requests queued before a restart are still served
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._worker_task = asyncio.create_task(self._run())
+
+    @staticmethod
+    def _fail(batch: List[Tuple[str, asyncio.Future]], error: BaseException):
+        """Resolve every unresolved future in `batch` with `error`"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self):
+        """Collect up to max_batch requests within max_wait and score them together"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[str, asyncio.Future]] = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                results = await self.analyze([text for text, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except asyncio.CancelledError:
+                # Don't leave callers of the batch being collected or scored waiting forever
+                self._fail(batch, RuntimeError("Sentiment analyzer closed"))
+                raise
+            except Exception as e:
+                logger.error(f"Error in batched sentiment analysis: {str(e)}")
+                self._fail(batch, e)
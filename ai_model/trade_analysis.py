@@ -1,17 +1,53 @@
 import logging
 from typing import Dict, Any, List, Optional
-import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-import torch
+import numpy as np
 from agent.models import MarketData, TradingSignal
+from ._indicator_kernels import ema, rolling_mean_std, rsi_wilder
 
 logger = logging.getLogger(__name__)
 
+_BULLISH = frozenset({'oversold', 'bullish_crossover', 'bb_lower_break'})
+_BEARISH = frozenset({'overbought', 'bearish_crossover', 'bb_upper_break'})
+# Patterns that confirm each trend when scoring signal strength
+_CONFIRMING = {
+    'up': frozenset({'bullish_crossover', 'oversold'}),
+    'down': frozenset({'bearish_crossover', 'overbought'})
+}
+# MACD(12, 26, 9): the EMAs are seeded with the first price, so the line only means something once the
+# slow EMA and then the signal EMA have each seen a full span
+_MACD_FAST, _MACD_SLOW, _MACD_SIGNAL = 12, 26, 9
+_MACD_MIN_PRICES = _MACD_SLOW + _MACD_SIGNAL
+
+class PriceRing:
+    """Fixed-size price history whose latest prices are always a contiguous view
+
+    Every price is written twice, at `head` and `head + size`, so no window ever wraps around.
+    """
+    __slots__ = ("size", "buf", "head", "count")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buf = np.zeros(2 * size, dtype=np.float64)
+        self.head = 0  # Next write index
+        self.count = 0  # Number of stored prices
+
+    def push(self, price: float):
+        """Append a price, overwriting the oldest once full"""
+        self.buf[self.head] = price
+        self.buf[self.head + self.size] = price
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def window(self, n: int) -> np.ndarray:
+        """Return a view of the last `n` prices (fewer if not yet recorded), oldest first"""
+        end = self.head + self.size
+        return self.buf[end - min(n, self.count):end]
+
 class TradeAnalyzer:
     def __init__(self):
         """Initialize trade analysis components"""
-        self.patterns = []
-        self.scaler = MinMaxScaler()
+        self.history_size = 64  # Prices kept per symbol; MACD needs _MACD_MIN_PRICES of them before it is reported
+        self._prices: Dict[str, PriceRing] = {}
         self._initialize_indicators()
         
     def _initialize_indicators(self):
@@ -25,15 +61,38 @@ class TradeAnalyzer:
     async def analyze_pattern(self, market_data: MarketData) -> Optional[Dict[str, Any]]:
         """Analyze trading patterns from market data"""
         try:
-            # For now, return basic market data
-            return {
+            result = {
                 "price": market_data.price,
                 "change_24h": market_data.change_24h,
                 "volume": market_data.volume,
-                "patterns": [],  # Add actual pattern detection here
-                "signals": [],   # Add actual signals here
+                "patterns": [],
+                "signals": [],
                 "trend": "neutral"
             }
+
+            # Placeholder quotes (price 0) are neither recorded nor analyzed; indicators from older
+            # history would otherwise be reported next to a missing price
+            if market_data.price <= 0:
+                return result
+            self.push_price(market_data.symbol, market_data.price)
+            prices = self._window(market_data.symbol, self.history_size)
+
+            indicators = self._calculate_indicators(prices)
+            patterns = self._detect_patterns(prices, indicators)
+            result["patterns"] = patterns
+            result["trend"] = self._determine_trend(patterns)
+
+            # Only report indicators that have enough history to be meaningful
+            rsi = indicators.get("RSI")
+            if rsi is not None and np.isfinite(rsi):
+                result["rsi"] = rsi
+            macd = indicators.get("MACD")
+            if macd and np.isfinite(macd["macd"]):
+                result["macd"] = {"value": macd["macd"], "signal": macd["signal"], "hist": macd["hist"]}
+            bb = indicators.get("BB")
+            if bb and np.isfinite(bb["middle"]):
+                result["bollinger"] = bb
+            return result
         except Exception as e:
             logger.error(f"Error in pattern analysis: {str(e)}")
             return None
@@ -53,95 +112,80 @@ class TradeAnalyzer:
             logger.error(f"Error generating signals: {str(e)}")
             return None
 
-    def _prepare_data(self, market_data: MarketData) -> pd.DataFrame:
-        """Prepare market data for analysis"""
-        data = {
-            'price': [market_data.price],
-            'volume': [market_data.volume],
-            'change_24h': [market_data.change_24h]
-        }
-        return pd.DataFrame(data)
+    def push_price(self, symbol: str, price: float):
+        """Record the latest price for a symbol"""
+        ring = self._prices.get(symbol)
+        if ring is None:
+            ring = self._prices[symbol] = PriceRing(self.history_size)
+        ring.push(price)
 
-    def _calculate_indicators(self, df: pd.DataFrame) -> Dict[str, float]:
+    def _window(self, symbol: str, n: int) -> np.ndarray:
+        """Return the symbol's last `n` recorded prices as a contiguous array"""
+        ring = self._prices.get(symbol)
+        if ring is None:
+            return np.empty(0, dtype=np.float64)
+        return ring.window(n)
+
+    def _calculate_indicators(self, prices: np.ndarray) -> Dict[str, float]:
         """Calculate technical indicators"""
         results = {}
         for name, func in self.indicators.items():
             try:
-                results[name] = func(df)
+                results[name] = func(prices)
             except Exception as e:
                 logger.error(f"Error calculating {name}: {str(e)}")
                 results[name] = None
         return results
 
-    def _calculate_rsi(self, df: pd.DataFrame, periods: int = 14) -> float:
-        """Calculate Relative Strength Index"""
+    def _calculate_rsi(self, prices: np.ndarray, periods: int = 14) -> float:
+        """Calculate Relative Strength Index with Wilder's smoothing"""
         try:
-            # Calculate price changes
-            delta = df['price'].diff()
-            
-            # Separate gains and losses
-            gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
-            
-            # Calculate RS and RSI
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi.iloc[-1]
+            return float(rsi_wilder(prices, periods)[-1])
         except Exception as e:
             logger.error(f"Error calculating RSI: {str(e)}")
             return 50.0
 
-    def _calculate_macd(self, df: pd.DataFrame) -> Dict[str, float]:
-        """Calculate MACD indicator"""
+    def _calculate_macd(self, prices: np.ndarray) -> Dict[str, float]:
+        """Calculate MACD indicator; NaN until the window holds _MACD_MIN_PRICES prices"""
         try:
-            # Calculate EMAs
-            exp1 = df['price'].ewm(span=12, adjust=False).mean()
-            exp2 = df['price'].ewm(span=26, adjust=False).mean()
-            
+            if len(prices) < _MACD_MIN_PRICES:
+                return {'macd': np.nan, 'signal': np.nan, 'hist': np.nan}
+
             # Calculate MACD line and signal line
-            macd_line = exp1 - exp2
-            signal_line = macd_line.ewm(span=9, adjust=False).mean()
-            
-            # Calculate histogram
-            histogram = macd_line - signal_line
+            macd_line = ema(prices, _MACD_FAST) - ema(prices, _MACD_SLOW)
+            signal_line = ema(macd_line, _MACD_SIGNAL)
             
             return {
-                'macd': macd_line.iloc[-1],
-                'signal': signal_line.iloc[-1],
-                'hist': histogram.iloc[-1]
+                'macd': float(macd_line[-1]),
+                'signal': float(signal_line[-1]),
+                'hist': float(macd_line[-1] - signal_line[-1])
             }
         except Exception as e:
             logger.error(f"Error calculating MACD: {str(e)}")
             return {'macd': 0.0, 'signal': 0.0, 'hist': 0.0}
 
-    def _calculate_bollinger_bands(self, df: pd.DataFrame, window: int = 20) -> Dict[str, float]:
+    def _calculate_bollinger_bands(self, prices: np.ndarray, window: int = 20) -> Dict[str, float]:
         """Calculate Bollinger Bands"""
         try:
-            # Calculate middle band (20-day SMA)
-            middle_band = df['price'].rolling(window=window).mean()
-            
-            # Calculate standard deviation
-            std_dev = df['price'].rolling(window=window).std()
-            
-            # Calculate upper and lower bands
-            upper_band = middle_band + (std_dev * 2)
-            lower_band = middle_band - (std_dev * 2)
+            # Middle band (20-period SMA) and sample standard deviation, NaN until a full window
+            mean, std = rolling_mean_std(prices, window)
+            middle_band = mean[-1]
+            std_dev = std[-1]
             
             return {
-                'upper': upper_band.iloc[-1],
-                'middle': middle_band.iloc[-1],
-                'lower': lower_band.iloc[-1]
+                'upper': float(middle_band + std_dev * 2),
+                'middle': float(middle_band),
+                'lower': float(middle_band - std_dev * 2)
             }
         except Exception as e:
             logger.error(f"Error calculating Bollinger Bands: {str(e)}")
             return {'upper': 0.0, 'middle': 0.0, 'lower': 0.0}
 
-    def _detect_patterns(self, df: pd.DataFrame, indicators: Dict[str, Any]) -> List[str]:
+    def _detect_patterns(self, prices: np.ndarray, indicators: Dict[str, Any]) -> List[str]:
         """Detect chart patterns"""
         patterns = []
         try:
-            price = df['price'].iloc[-1]
+            price = prices[-1]
             
             # Check for oversold/overbought conditions
             if indicators['RSI'] < 30:
@@ -149,7 +193,7 @@ class TradeAnalyzer:
             elif indicators['RSI'] > 70:
                 patterns.append('overbought')
             
-            # Check for MACD crossovers
+            # Check for MACD crossovers; a NaN MACD during warm-up matches neither
             if indicators['MACD']['hist'] > 0 and indicators['MACD']['macd'] > indicators['MACD']['signal']:
                 patterns.append('bullish_crossover')
             elif indicators['MACD']['hist'] < 0 and indicators['MACD']['macd'] < indicators['MACD']['signal']:
@@ -170,11 +214,10 @@ class TradeAnalyzer:
     def _determine_trend(self, patterns: List[str]) -> str:
         """Determine overall trend from patterns"""
         try:
-            bullish_patterns = ['oversold', 'bullish_crossover', 'bb_lower_break']
-            bearish_patterns = ['overbought', 'bearish_crossover', 'bb_upper_break']
-            
-            bullish_count = sum(1 for p in patterns if p in bullish_patterns)
-            bearish_count = sum(1 for p in patterns if p in bearish_patterns)
+            bullish_count = bearish_count = 0
+            for p in patterns:
+                bullish_count += p in _BULLISH
+                bearish_count += p in _BEARISH
             
             if bullish_count > bearish_count:
                 return "up"
@@ -192,10 +235,10 @@ class TradeAnalyzer:
             strength = 0.5  # Start at neutral
             
             # Add strength for trend-confirming patterns
-            trend = patterns.get('trend', 'neutral')
-            confirming_patterns = sum(1 for p in patterns.get('patterns', [])
-                                   if (trend == 'up' and p in ['bullish_crossover', 'oversold']) or
-                                      (trend == 'down' and p in ['bearish_crossover', 'overbought']))
+            confirming = _CONFIRMING.get(patterns.get('trend', 'neutral'), frozenset())
+            confirming_patterns = 0
+            for p in patterns.get('patterns', ()):
+                confirming_patterns += p in confirming
             
             # Adjust strength based on confirming patterns
             strength += (confirming_patterns * 0.1)  # Each confirming pattern adds 0.1
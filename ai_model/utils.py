@@ -8,5 +8,6 @@ def load_model_config() -> Dict[str, Any]:
         "sentiment_model_path": "ProsusAI/finbert",
         "pattern_model_path": "microsoft/phi-2",  # or another suitable model
         "model_save_dir": str(Path(__file__).parent / "saved_models"),
+        "sentiment_onnx_dir": str(Path(__file__).parent / "saved_models" / "finbert_onnx"),
         "cache_dir": str(Path(__file__).parent / "model_cache")
     } 
\ No newline at end of file
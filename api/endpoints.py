@@ -1,11 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
+from fastapi.responses import ORJSONResponse
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 from agent.agent import TradingAgent
-from agent.models import TradeAnalysis, MarketData, SentimentAnalysis
+from ai_model._singletons import get_sentiment
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 trading_agent = TradingAgent()
 
 class MarketAnalysisRequest(BaseModel):
@@ -25,7 +26,7 @@ async def analyze_market(request: MarketAnalysisRequest):
         analysis = await trading_agent.analyze_market(request.symbol)
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not available")
-        return analysis
+        return {**analysis.to_dict(), "recommendation": analysis.recommendation.value.upper()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -33,7 +34,8 @@ async def analyze_market(request: MarketAnalysisRequest):
 async def analyze_sentiment(symbol: str):
     """Analyze market sentiment for a given symbol"""
     try:
-        sentiment = await trading_agent.sentiment_analyzer.analyze(symbol)
+        analyzer = await get_sentiment()
+        sentiment = await analyzer.analyze_one(symbol)
         if not sentiment:
             raise HTTPException(status_code=404, detail="Sentiment analysis not available")
         return sentiment
@@ -47,7 +49,7 @@ async def generate_signal(request: TradeSignalRequest):
         signal = await trading_agent.generate_trade_signal(request.symbol)
         if not signal:
             raise HTTPException(status_code=404, detail="No trading signal available")
-        return signal
+        return Response(content=signal.to_json(), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,35 +1,48 @@
 import logging
+import asyncio
 import aiohttp
 from typing import Dict, Any, Optional
-from config import settings
-from datetime import datetime
+from config.settings import settings
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
 class RequestHandler:
     def __init__(self):
         """Initialize request handler with configuration"""
-        self.base_url = settings.API_BASE_URL
+        self.base_url = settings.API_BASE_URL_OPENSERV
         self.timeout = settings.REQUEST_TIMEOUT
         self.max_retries = settings.MAX_RETRIES
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared client session, creating it inside the running event loop on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared client session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def process_request(self, endpoint: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process API request with retry logic"""
         for attempt in range(self.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{self.base_url}/{endpoint}",
-                        json=data,
-                        timeout=self.timeout
-                    ) as response:
-                        if response.status == 200:
-                            return await response.json()
-                        
-                        logger.error(
-                            f"Request failed (attempt {attempt + 1}/{self.max_retries}): "
-                            f"Status {response.status}"
-                        )
+                session = await self._get_session()
+                async with session.post(f"{self.base_url}/{endpoint}", json=data) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    
+                    logger.error(
+                        f"Request failed (attempt {attempt + 1}/{self.max_retries}): "
+                        f"Status {response.status}"
+                    )
                         
             except Exception as e:
                 logger.error(f"Request error (attempt {attempt + 1}/{self.max_retries}): {str(e)}")
@@ -41,7 +54,6 @@ class RequestHandler:
 
     async def _wait_before_retry(self, attempt: int):
         """Implement exponential backoff for retries"""
-        import asyncio
         wait_time = min(2 ** attempt, 30)  # Max 30 seconds
         await asyncio.sleep(wait_time)
 
@@ -56,5 +68,5 @@ class RequestHandler:
         return {
             "status": "error",
             "message": str(error),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         } 
\ No newline at end of file
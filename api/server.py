@@ -2,7 +2,11 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from config import settings
+from agent.market_data import close_session
+from ai_model._singletons import get_sentiment
+from api.request_handler import RequestHandler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,15 +16,24 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events"""
     logger.info("TradeMateAI API starting up...")
+    # Load FinBERT and run one forward pass so kernel selection happens before the first request
+    analyzer = await get_sentiment()
+    await analyzer.analyze(["warmup"])
+    # One request handler per app so its HTTP connections are pooled and reused
+    app.state.request_handler = RequestHandler()
     yield
     logger.info("TradeMateAI API shutting down...")
+    await app.state.request_handler.close()
+    await close_session()
+    await analyzer.close()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="TradeMateAI API",
     description="AI-powered trading analysis and recommendations",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
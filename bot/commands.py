@@ -8,12 +8,41 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from agent.agent import TradingAgent
 from data.logs.logger import setup_logger
-from .utils import format_price_data
-from typing import Dict, Any
+from functools import lru_cache, wraps
 from config.settings import settings
 
 logger = setup_logger(__name__)
-trading_agent = TradingAgent()
+
+@lru_cache(maxsize=1)
+def get_agent() -> TradingAgent:
+    """Return the shared TradingAgent, constructed on first use"""
+    return TradingAgent()
+
+# Reply templates, formatted per request with str.format
+_MARKET_TEMPLATE = (
+    "📊 Market Analysis for {symbol}\n\n"
+    "💰 Price: ${price:,.2f}\n"
+    "📈 24h Change: {change_24h:+.2f}%\n"
+    "📊 Volume: ${volume:,.0f}\n"
+    "📰 Sentiment: {sentiment}\n"
+    "🎯 Confidence: {confidence:.2f}\n"
+    "📝 Recommendation: {recommendation}"
+)
+_SENTIMENT_TEMPLATE = (
+    "📰 Sentiment Analysis for {symbol}\n\n"
+    "Overall: {sentiment}\n"
+    "Confidence: {confidence:.2f}\n"
+    "Sources: {sources}"
+)
+_TRADE_TEMPLATE = (
+    "🎯 Trading Signal for {symbol}\n\n"
+    "Signal: {signal}\n"
+    "Confidence: {confidence:.2f}\n"
+    "Indicators: {indicators}\n"
+    "Time: {timestamp:%Y-%m-%d %H:%M:%S UTC}"
+)
+_SETTINGS_HEADER = "⚙️ Current Settings:\n\n"
+_SETTINGS_FOOTER = "Use /help to see available commands."
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command"""
@@ -25,7 +54,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "📰 Sentiment Analysis\n\n"
         "Use /help to see all available commands."
     )
-    await update.message.reply_text(welcome_message)
+    await update.effective_message.reply_text(welcome_message)
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /help command"""
@@ -37,117 +66,119 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/settings - View/update settings\n"
         "/help - Show this help message"
     )
-    await update.message.reply_text(help_text)
+    await update.effective_message.reply_text(help_text)
 
+def with_error_reply(command: str, error_message: str):
+    """Log any exception raised by a command handler and reply with `error_message`"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            try:
+                await func(update, context)
+            except Exception as e:
+                logger.error("Error in %s command: %s", command, e)
+                await update.effective_message.reply_text(error_message)
+        return wrapper
+    return decorator
+
+@with_error_reply("market", "❌ An error occurred while analyzing the market")
 async def market_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /market command"""
-    try:
-        if not context.args:
-            await update.message.reply_text("Please provide a trading pair symbol (e.g., /market BTC/USD)")
-            return
-            
-        symbol = context.args[0].upper()
-        analysis = await trading_agent.analyze_market(symbol)
+    reply = update.effective_message.reply_text
+    if not context.args:
+        await reply("Please provide a trading pair symbol (e.g., /market BTC/USD)")
+        return
+        
+    symbol = context.args[0].upper()
+    analysis = await get_agent().analyze_market(symbol)
+    
+    if analysis:
+        response = _MARKET_TEMPLATE.format(
+            symbol=symbol,
+            price=analysis.price,
+            change_24h=analysis.change_24h,
+            volume=analysis.volume,
+            sentiment=analysis.sentiment.value,
+            confidence=analysis.confidence,
+            recommendation=analysis.recommendation.value.upper()
+        )
+    else:
+        response = f"❌ Failed to analyze market for {symbol}"
         
-        if analysis:
-            response = (
-                f"📊 Market Analysis for {symbol}\n\n"
-                f"💰 Price: ${analysis['price']:,.2f}\n"
-                f"📈 24h Change: {analysis['change_24h']:+.2f}%\n"
-                f"📊 Volume: ${analysis['volume']:,.0f}\n"
-                f"📰 Sentiment: {analysis['sentiment']}\n"
-                f"🎯 Confidence: {analysis['confidence']:.2f}\n"
-                f"📝 Recommendation: {analysis['recommendation']}"
-            )
-        else:
-            response = f"❌ Failed to analyze market for {symbol}"
-            
-        await update.message.reply_text(response)
-    except Exception as e:
-        logger.error(f"Error in market command: {str(e)}")
-        await update.message.reply_text("❌ An error occurred while analyzing the market")
+    await reply(response)
 
+@with_error_reply("sentiment", "❌ An error occurred while analyzing sentiment")
 async def sentiment_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /sentiment command"""
-    try:
-        if not context.args:
-            await update.message.reply_text("Please provide a symbol (e.g., /sentiment BTC)")
-            return
-            
-        symbol = context.args[0].upper()
-        sentiment = await trading_agent.analyze_sentiment(symbol)
+    reply = update.effective_message.reply_text
+    if not context.args:
+        await reply("Please provide a symbol (e.g., /sentiment BTC)")
+        return
         
-        if sentiment:
-            response = (
-                f"📰 Sentiment Analysis for {symbol}\n\n"
-                f"Overall: {sentiment['sentiment']}\n"
-                f"Confidence: {sentiment['confidence']:.2f}\n"
-                f"Sources: {len(sentiment['sources'])}"
-            )
-        else:
-            response = f"❌ Failed to analyze sentiment for {symbol}"
-            
-        await update.message.reply_text(response)
-    except Exception as e:
-        logger.error(f"Error in sentiment command: {str(e)}")
-        await update.message.reply_text("❌ An error occurred while analyzing sentiment")
+    symbol = context.args[0].upper()
+    sentiment = await get_agent().analyze_sentiment(symbol)
+    
+    if sentiment:
+        response = _SENTIMENT_TEMPLATE.format(
+            symbol=symbol,
+            sentiment=sentiment.sentiment.value,
+            confidence=sentiment.confidence,
+            sources=len(sentiment.sources)
+        )
+    else:
+        response = f"❌ Failed to analyze sentiment for {symbol}"
+        
+    await reply(response)
 
+@with_error_reply("trade", "❌ An error occurred while generating trading signals")
 async def trade_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /trade command for trading signals"""
-    try:
-        if not context.args:
-            await update.message.reply_text("Please provide a symbol (e.g., /trade BTC/USD)")
-            return
-            
-        symbol = context.args[0].upper()
-        signal = await trading_agent.generate_trade_signal(symbol)
+    reply = update.effective_message.reply_text
+    if not context.args:
+        await reply("Please provide a symbol (e.g., /trade BTC/USD)")
+        return
+        
+    symbol = context.args[0].upper()
+    signal = await get_agent().generate_trade_signal(symbol)
+    
+    if signal:            
+        response = _TRADE_TEMPLATE.format(
+            symbol=symbol,
+            signal=signal.recommendation.value,
+            confidence=signal.confidence,
+            indicators=', '.join(signal.indicators or ['No indicators']),
+            timestamp=signal.timestamp
+        )
+    else:
+        response = f"❌ No trading signals available for {symbol}"
         
-        if signal:            
-            response = (
-                f"🎯 Trading Signal for {symbol}\n\n"
-                f"Signal: {signal.recommendation.value}\n"
-                f"Confidence: {signal.confidence:.2f}\n"
-                f"Indicators: {', '.join(signal.indicators or ['No indicators'])}\n"
-                f"Time: {signal.timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}"
-            )
-        else:
-            response = f"❌ No trading signals available for {symbol}"
-            
-        await update.message.reply_text(response)
-    except Exception as e:
-        logger.error(f"Error in trade command: {str(e)}")
-        await update.message.reply_text("❌ An error occurred while generating trading signals")
+    await reply(response)
 
+@with_error_reply("settings", "❌ Failed to retrieve settings")
 async def settings_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /settings command"""
-    try:
-        # Get current settings
-        current_settings = {
-            "Trading": {
-                "Min Amount": f"${settings.MIN_TRADE_AMOUNT:,.4f}",
-                "Max Amount": f"${settings.MAX_TRADE_AMOUNT:,.2f}",
-                "Default Timeframe": settings.DEFAULT_TIMEFRAME
-            },
-            "Analysis": {
-                "Sentiment Model": settings.SENTIMENT_MODEL,
-                "Pattern Model": settings.PATTERN_MODEL
-            }
+    # Get current settings
+    current_settings = {
+        "Trading": {
+            "Min Amount": f"${settings.MIN_TRADE_AMOUNT:,.4f}",
+            "Max Amount": f"${settings.MAX_TRADE_AMOUNT:,.2f}",
+            "Default Timeframe": settings.DEFAULT_TIMEFRAME
+        },
+        "Analysis": {
+            "Sentiment Model": settings.SENTIMENT_MODEL,
+            "Pattern Model": settings.PATTERN_MODEL
         }
+    }
+    
+    # Format settings message
+    parts = [_SETTINGS_HEADER]
+    for category, values in current_settings.items():
+        parts.append(f"📌 {category}:\n")
+        for key, value in values.items():
+            parts.append(f"  • {key}: {value}\n")
+        parts.append("\n")
         
-        # Format settings message
-        response = "⚙️ Current Settings:\n\n"
-        for category, values in current_settings.items():
-            response += f"📌 {category}:\n"
-            for key, value in values.items():
-                response += f"  • {key}: {value}\n"
-            response += "\n"
-            
-        response += "Use /help to see available commands."
-        
-        await update.message.reply_text(response)
-        
-    except Exception as e:
-        logger.error(f"Error in settings command: {str(e)}")
-        await update.message.reply_text("❌ Failed to retrieve settings")
+    parts.append(_SETTINGS_FOOTER)
+    await update.effective_message.reply_text("".join(parts))
 
 # Similar implementations for snipe_command, report_command, and settings_command... 
\ No newline at end of file
@@ -1,28 +1,31 @@
-import logging
+import re
 from telegram import Update
 from telegram.ext import ContextTypes
 from data.logs.logger import setup_logger  # Use the centralized logger setup
 
 logger = setup_logger(__name__)
 
+# Words that get pointed at /help
+_HELP_TRIGGERS = frozenset({"help", "commands", "how"})
+
 async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle non-command messages"""
     try:
-        # Process user message
-        message = update.message.text.lower()
+        # Process user message, tokenized once; punctuation is dropped so "help?" still matches
+        words = re.findall(r"\w+", update.message.text.lower())
         
         # Add custom message handling logic here
-        if "help" in message:
+        if not _HELP_TRIGGERS.isdisjoint(words):
             await update.message.reply_text("Use /help to see available commands!")
         else:
             await update.message.reply_text("I only respond to commands. Use /help to see what I can do!")
     except Exception as e:
-        logger.error(f"Error in message handler: {str(e)}")
+        logger.error("Error in message handler: %s", e)
         await update.message.reply_text("❌ Sorry, I couldn't process your message")
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle bot errors"""
-    logger.error(f"Update {update} caused error: {context.error}")
+    logger.error("Update %s caused error: %s", update, context.error)
     
     try:
         if update and update.message:
@@ -30,4 +33,4 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 "❌ Sorry, something went wrong. Please try again later."
             )
     except Exception as e:
-        logger.error(f"Error in error handler: {str(e)}") 
\ No newline at end of file
+        logger.error("Error in error handler: %s", e) 
\ No newline at end of file
@@ -1,15 +1,50 @@
 import os
+import asyncio
+import importlib
 from telegram import Update
-from telegram.ext import ApplicationBuilder, CommandHandler, CallbackContext
-from .commands import *
+from telegram.ext import ApplicationBuilder, CommandHandler
+from .commands import (
+    start_command,
+    help_command,
+    market_command,
+    sentiment_command,
+    trade_command,
+    settings_command
+)
+from .utils import close_session, setup_logging, stop_logging
 
 # Load the bot token from the .env file
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 
 
 
+async def _prewarm_sentiment() -> None:
+    """Import torch/transformers and load FinBERT without blocking the event loop"""
+    # The import alone takes seconds, so it runs in a worker thread like the model load itself
+    singletons = await asyncio.to_thread(importlib.import_module, "ai_model._singletons")
+    await singletons.get_sentiment()
+
+async def post_init(application) -> None:
+    """Load FinBERT in the background, so /start and /help are answered while it loads"""
+    application.create_task(_prewarm_sentiment())
+
+async def post_shutdown(application) -> None:
+    """Release shared resources once the bot has stopped"""
+    await close_session()
+    stop_logging()
+
 def main() -> None:
-    application = ApplicationBuilder().token(BOT_TOKEN).build()
+    # Log records are written by a background thread from here on; post_shutdown stops it
+    setup_logging()
+
+    # libuv-backed event loop when available; run_polling creates its loop from the installed policy
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    application = ApplicationBuilder().token(BOT_TOKEN).post_init(post_init).post_shutdown(post_shutdown).build()
 
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(CommandHandler("help", help_command))
@@ -18,7 +53,8 @@ def main() -> None:
     application.add_handler(CommandHandler("trade", trade_command))
     application.add_handler(CommandHandler("settings", settings_command))
 
-    application.run_polling()
+    # Only commands are handled, so don't have Telegram send any other update types
+    application.run_polling(allowed_updates=[Update.MESSAGE])
 
 if __name__ == '__main__':
     main()
@@ -1,88 +1,58 @@
 import logging
-import aiohttp
+import queue
 from datetime import datetime
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, Any, Optional
+# Kraken market data lives in agent.market_data so the agent and API can use it without the bot
+from agent.market_data import close_session, fetch_market_data, format_kraken_symbol, get_session
 from config.settings import settings
 from data.logs.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Background writer for queued log records, started by setup_logging
+_log_listener: Optional[QueueListener] = None
 
 def setup_logging():
-    """Configure logging settings"""
-    logging.basicConfig(
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        level=settings.LOG_LEVEL,
-        handlers=[
-            logging.FileHandler(settings.LOG_FILE),
-            logging.StreamHandler()
-        ]
-    )
+    """Configure logging settings
 
-def format_kraken_symbol(symbol: str) -> str:
-    """Convert common symbol format to Kraken format"""
-    # Remove '/' if present and convert to uppercase
-    clean_symbol = symbol.replace('/', '').upper()
-    # Map common names to Kraken pairs if needed
-    symbol_map = {
-        'BTCUSD': 'XBTUSD',
-        'BTCEUR': 'XBTEUR',
-        'ETHUSD': 'XETHUSD',
-        'ETHEUR': 'XETHZEUR',
-        'XRPUSD': 'XXRPUSD',
-        'XRPETH': 'XXRPETH',
-        'XRPUSD': 'XXRPUSD',
-        'XRPETH': 'XXRPETH',
-        'SOLUSD': 'SOLUSD',
-        'SOLUSDT': 'SOLUSDT',
-        'SOLBTC': 'SOLBTC',
-        'SOLXRP': 'SOLXRP',
-        'SOLETH': 'SOLETH',
-        'SOLJPY': 'SOLJPY',
-        'SOLXRP': 'SOLXRP',
-        'SOLETH': 'SOLETH',
-        'SOLJPY': 'SOLJPY',
-    }
-    return symbol_map.get(clean_symbol, clean_symbol)
+    Records are queued by the root logger and written by a background thread, so file writes never block the event loop.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
 
-async def fetch_market_data(symbol: str) -> Optional[Dict[str, Any]]:
-    """Fetch real-time market data from Kraken"""
-    try:
-        kraken_symbol = format_kraken_symbol(symbol)
-        url = f"{settings.API_BASE_URL_KRAKEN}/public/Ticker?pair={kraken_symbol}"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=settings.REQUEST_TIMEOUT) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("error"):
-                        logger.error(f"Kraken API error: {data['error']}")
-                        return None
-                        
-                    result = data.get("result", {})
-                    if not result:
-                        logger.error("No data in Kraken response")
-                        return None
-                        
-                    # Get the first (and usually only) ticker data
-                    ticker_data = next(iter(result.values()))
-                    
-                    return {
-                        "symbol": symbol,
-                        "price": float(ticker_data["c"][0]),  # Current price
-                        "change_24h": float(ticker_data["p"][1]),  # 24h price change
-                        "volume": float(ticker_data["v"][1]),  # 24h volume
-                        "high": float(ticker_data["h"][1]),  # 24h high
-                        "low": float(ticker_data["l"][1]),  # 24h low
-                        "timestamp": datetime.now().timestamp()
-                    }
-                else:
-                    logger.error(f"Kraken API error: Status {response.status}")
-                    return None
-                    
-    except Exception as e:
-        logger.error(f"Error fetching market data from Kraken: {str(e)}")
-        return None
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler(settings.LOG_FILE), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # The queue handler gets no formatter, so the prefix is added only once: QueueHandler.prepare() merges the
+    # message and traceback on the calling thread, and the listener's handlers apply the full format
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL)
+    root.addHandler(QueueHandler(log_queue))
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+
+def stop_logging():
+    """Flush queued log records and stop the background writer"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+_PRICE_TEMPLATE = (
+    "📊 {symbol} Market Data\n\n"
+    "💰 Price: ${price:,.2f}\n"
+    "📈 24h Change: {change_24h:+.2f}%\n"
+    "📊 Volume: ${volume:,.0f}\n"
+    "📈 24h High: ${high:,.2f}\n"
+    "📉 24h Low: ${low:,.2f}\n"
+    "🕒 Updated: {updated}"
+)
 
 def format_price_data(data: Dict[str, Any]) -> str:
     """Format market data for display"""
@@ -90,18 +60,15 @@ def format_price_data(data: Dict[str, Any]) -> str:
         if not data:
             return "❌ No market data available"
             
-        return (
-            f"📊 {data['symbol']} Market Data\n\n"
-            f"💰 Price: ${data['price']:,.2f}\n"
-            f"📈 24h Change: {data['change_24h']:+.2f}%\n"
-            f"📊 Volume: ${data['volume']:,.0f}\n"
-            f"📈 24h High: ${data['high']:,.2f}\n"
-            f"📉 24h Low: ${data['low']:,.2f}\n"
-            f"🕒 Updated: {datetime.fromtimestamp(data['timestamp']).strftime('%H:%M:%S')}"
-        )
+        return _PRICE_TEMPLATE.format_map({**data, "updated": _format_second(int(data['timestamp']), '%H:%M:%S')})
     except Exception as e:
-        logger.error(f"Error formatting price data: {str(e)}")
+        logger.error("Error formatting price data: %s", e)
         return "❌ Error formatting market data"
 
+@lru_cache(maxsize=128)
+def _format_second(second: int, fmt: str) -> str:
+    """Format a whole-second timestamp; output only changes once per second, so results are memoized"""
+    return datetime.fromtimestamp(second).strftime(fmt)
+
 def format_timestamp(timestamp):
-    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S') 
\ No newline at end of file
+    return _format_second(int(timestamp), '%Y-%m-%d %H:%M:%S') 
\ No newline at end of file
@@ -1,7 +1,6 @@
 import os
 from pathlib import Path
 from pydantic_settings import BaseSettings
-from functools import lru_cache
 from typing import Optional
 
 # Project root directory
@@ -27,6 +26,7 @@ class Settings(BaseSettings):
     PORT: int = 5500
     REQUEST_TIMEOUT: int = 30
     MAX_RETRIES: int = 3
+    TICKER_TTL_SECONDS: float = 3.0  # How long a fetched Kraken ticker is reused
     
     # WebSocket Configuration
     WEBSOCKET_URL: str = "wss://ws.kraken.com"
@@ -56,9 +56,5 @@ class Settings(BaseSettings):
         case_sensitive = True
         extra = "allow"  # Allow extra fields in the settings
 
-@lru_cache()
-def get_settings() -> Settings:
-    """Get cached settings instance"""
-    return Settings()
-
-settings = get_settings() 
\ No newline at end of file
+# Single settings instance, read once at import
+settings: Settings = Settings()